@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Per-Class Input Builder (Stratified)
+
+Script untuk membangun input Excel per class (Area Fungsi x Level Okupasi)
+untuk multiturn.ipynb dari dataset flagged/corrected master.
+- Master dibaca SEKALI (satu file .xlsx atau folder berisi chunk .xlsx)
+- Row di-group berdasarkan (Area_Fungsi, Level_Okupasi) dengan index sekali jalan
+- Seeded stratified sampling sampai quota per class
+- Class yang kurang dari quota dilaporkan (ditulis dengan semua row yang ada)
+- Row Okupasi Non TIK (Level_Okupasi kosong di master) diberi level "Okupasi Non TIK"
+- Semua file per class (dan shard Rows_x-y opsional) ditulis dalam satu pass
+
+Nama file mengikuti format yang diharapkan multiturn.ipynb dan
+DatasetValidator._parse_folder_name, contoh:
+    Keamanan_Informasi_dan_Siber_5.xlsx
+    Sains_Data_Kecerdasan_Artifisial_7.xlsx
+    Okupasi_Non_TIK_Okupasi_Non_TIK.xlsx
+
+Usage:
+    python build_class_inputs.py "../../Pipeline Flagging/Data Diploy Flagged" --per-class 500 --output ../Flagged_500_Per_Class --overwrite
+    python build_class_inputs.py master.xlsx --per-class 1000 --output "../../Pipeline Flagging/Data Diploy Flagged/Flagged_1000_Per_Class"
+    python build_class_inputs.py master.xlsx --per-class 500 --rows-per-shard 100 --seed 42 --output ../Flagged_500_Per_Class
+"""
+
+import argparse
+import shutil
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from validate_dataset import DatasetValidator
+
+
+AREA_COLUMN = "Area_Fungsi"
+LEVEL_COLUMN = "Level_Okupasi"
+
+# Pola nama file master flagged (chunk hasil pipeline flagging)
+DEFAULT_MASTER_GLOB = "diploy_flagged_*.xlsx"
+
+# Area tanpa level okupasi: level diisi dengan nama area (format input lama)
+NON_TIK_AREA = "okupasi non tik"
+
+
+def _normalize_level(value) -> Optional[str]:
+    """Normalisasi level: 7 / 7.0 / "7" -> "7", non-numeric (Okupasi Non TIK) apa adanya."""
+    if value is None or pd.isna(value):
+        return None
+    s = str(value).strip()
+    if not s:
+        return None
+    try:
+        return str(int(float(s)))
+    except ValueError:
+        return s
+
+
+def class_file_stem(area_fungsi: str, level: str) -> str:
+    """Nama file/folder per class.
+
+    Format: ("Keamanan Informasi Dan Siber", "5") -> Keamanan_Informasi_dan_Siber_5
+    """
+    words = area_fungsi.replace('-', ' ').split()
+    words = ['dan' if w.lower() == 'dan' else w for w in words]
+    level_words = level.split()
+    return '_'.join(words + level_words)
+
+
+def load_master(master_path: Path, pattern: str = DEFAULT_MASTER_GLOB) -> pd.DataFrame:
+    """Baca master dataset sekali (file tunggal atau semua chunk di folder)."""
+    if master_path.is_file():
+        print(f"Reading: {master_path.name}")
+        return pd.read_excel(master_path)
+
+    files = sorted(master_path.glob(pattern))
+    if not files:
+        raise FileNotFoundError(f"Tidak ada file '{pattern}' di {master_path}")
+
+    print(f"Reading {len(files)} files from: {master_path}")
+    frames = [pd.read_excel(f) for f in files]
+    return pd.concat(frames, ignore_index=True)
+
+
+def group_classes(df: pd.DataFrame) -> Tuple[Dict[Tuple[str, str], np.ndarray], Counter]:
+    """Group posisi row berdasarkan (Area Fungsi, Level) dalam satu pass.
+
+    Row Okupasi Non TIK dengan Level_Okupasi kosong diisi level = nama area
+    (langsung di df, sehingga ikut tertulis di output).
+
+    Returns:
+        (class_index, dropped) - class_index: (area, level) -> posisi row,
+        dropped: jumlah row yang dilewati per area
+    """
+    missing = [c for c in (AREA_COLUMN, LEVEL_COLUMN) if c not in df.columns]
+    if missing:
+        raise KeyError(f"Kolom tidak ditemukan di master: {missing}")
+
+    validator = DatasetValidator()
+    canonical = {validator._normalize_area_fungsi(a): a for a in DatasetValidator.AREA_FUNGSI_RANGES}
+
+    area_raw = df[AREA_COLUMN].astype('string').str.strip()
+    area_key = area_raw.map(lambda a: validator._normalize_area_fungsi(a) if isinstance(a, str) else None)
+    level_key = df[LEVEL_COLUMN].map(_normalize_level)
+
+    non_tik_fill = (area_key == NON_TIK_AREA).fillna(False) & level_key.isna()
+    if non_tik_fill.any():
+        df[LEVEL_COLUMN] = df[LEVEL_COLUMN].astype(object)
+        df.loc[non_tik_fill, LEVEL_COLUMN] = area_raw[non_tik_fill].astype(object)
+        level_key = level_key.where(~non_tik_fill, area_raw.astype(object))
+
+    valid_mask = area_key.notna() & (area_key != "") & level_key.notna()
+    dropped = Counter(area_raw[~valid_mask].fillna("(Area_Fungsi kosong)").astype(object))
+
+    keys = pd.DataFrame({'area': area_key[valid_mask], 'level': level_key[valid_mask]})
+    positions = np.flatnonzero(valid_mask.to_numpy())
+
+    class_index = {}
+    for (area_norm, level), idx in keys.groupby(['area', 'level'], sort=True).indices.items():
+        # Nama area kanonik dari AREA_FUNGSI_RANGES, fallback ke nilai pertama di data
+        area_name = canonical.get(area_norm) or area_raw.iloc[positions[idx[0]]]
+        class_index[(area_name, level)] = positions[idx]
+
+    return class_index, dropped
+
+
+def stratified_sample(class_index: Dict[Tuple[str, str], np.ndarray], per_class: int,
+                      seed: int) -> Dict[Tuple[str, str], np.ndarray]:
+    """Seeded sampling tanpa replacement sampai quota per class (urutan row asli dipertahankan)."""
+    rng = np.random.default_rng(seed)
+    sampled = {}
+    for key in sorted(class_index):
+        positions = class_index[key]
+        if len(positions) > per_class:
+            positions = np.sort(rng.choice(positions, size=per_class, replace=False))
+        sampled[key] = positions
+    return sampled
+
+
+def write_classes(df: pd.DataFrame, sampled: Dict[Tuple[str, str], np.ndarray], output_dir: Path,
+                  rows_per_shard: Optional[int] = None) -> List[Dict]:
+    """Tulis file Excel per class (dan shard Rows_x-y jika diminta).
+
+    Output directory diasumsikan sudah bersih (lihat prepare_output_dir).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    for (area, level), positions in sampled.items():
+        stem = class_file_stem(area, level)
+        class_df = df.iloc[positions]
+        class_df.to_excel(output_dir / f"{stem}.xlsx", index=False)
+
+        if rows_per_shard:
+            for start in range(0, len(class_df), rows_per_shard):
+                end = min(start + rows_per_shard, len(class_df))
+                shard_dir = output_dir / f"Rows_{start + 1}-{start + rows_per_shard}"
+                shard_dir.mkdir(exist_ok=True)
+                class_df.iloc[start:end].to_excel(shard_dir / f"{stem}.xlsx", index=False)
+
+        results.append({'area_fungsi': area, 'level': level, 'file': f"{stem}.xlsx", 'rows': len(class_df)})
+
+    return results
+
+
+def _stale_outputs(output_dir: Path) -> List[Path]:
+    """File class (*.xlsx) dan folder shard (Rows_*) dari build sebelumnya."""
+    if not output_dir.exists():
+        return []
+    return sorted(list(output_dir.glob("*.xlsx")) + [p for p in output_dir.glob("Rows_*") if p.is_dir()])
+
+
+def prepare_output_dir(output_dir: Path, overwrite: bool):
+    """Pastikan output tidak tercampur dengan hasil build sebelumnya.
+
+    Tanpa overwrite: raise FileExistsError jika ada output lama.
+    Dengan overwrite: hapus *.xlsx dan Rows_* lama (file lain, mis. notebook, dibiarkan).
+    """
+    stale = _stale_outputs(output_dir)
+    if not stale:
+        return
+
+    if not overwrite:
+        raise FileExistsError(
+            f"{output_dir} sudah berisi {len(stale)} output lama (*.xlsx / Rows_*); "
+            f"gunakan --overwrite untuk menggantinya"
+        )
+
+    print(f"Removing {len(stale)} old outputs from: {output_dir}")
+    for path in stale:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def print_summary(class_index: Dict[Tuple[str, str], np.ndarray], results: List[Dict],
+                  per_class: int, dropped: Counter, output_dir: Path):
+    """Print ringkasan build termasuk class yang kurang dari quota."""
+    under_filled = [r for r in results if r['rows'] < per_class]
+
+    print(f"\n{'='*70}")
+    print(f"[INFO] BUILD SUMMARY")
+    print(f"{'='*70}")
+    print(f"   Output: {output_dir}")
+    print(f"   Classes: {len(results)}")
+    print(f"   Quota per class: {per_class}")
+    print(f"   Rows written: {sum(r['rows'] for r in results)}")
+    if dropped:
+        print(f"   [WARNING] Rows tanpa Area_Fungsi/Level_Okupasi (dilewati): {sum(dropped.values())}")
+        for area, count in dropped.most_common():
+            print(f"      {area}: {count}")
+
+    print(f"\nPer Class:")
+    for r in results:
+        available = len(class_index[(r['area_fungsi'], r['level'])])
+        print(f"   {r['file']}: {r['rows']} rows (available: {available})")
+
+    if under_filled:
+        print(f"\n[WARNING] Under-filled Classes (< {per_class}):")
+        for r in under_filled:
+            print(f"   {r['area_fungsi']} - Level {r['level']}: {r['rows']}/{per_class} (kurang {per_class - r['rows']})")
+    else:
+        print(f"\n[SUCCESS] Semua class terpenuhi")
+
+    print(f"{'='*70}\n")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Build per-class (Area Fungsi x Level) Excel inputs for multiturn generation',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python build_class_inputs.py "../../Pipeline Flagging/Data Diploy Flagged" --per-class 500 --output ../Flagged_500_Per_Class --overwrite
+  python build_class_inputs.py master.xlsx --per-class 1000 --output "../../Pipeline Flagging/Data Diploy Flagged/Flagged_1000_Per_Class"
+  python build_class_inputs.py master.xlsx --per-class 500 --rows-per-shard 100 --seed 42 --output ../Flagged_500_Per_Class
+        """
+    )
+
+    parser.add_argument('master', help='Master flagged/corrected Excel file, atau folder berisi chunk Excel')
+    parser.add_argument('--per-class', type=int, default=500, help='Quota row per class (default: 500)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed sampling (default: 42)')
+    parser.add_argument('--output', type=str, metavar='DIR', required=True,
+                        help='Output directory (mis. ../Flagged_500_Per_Class)')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Hapus *.xlsx dan Rows_* lama di output directory sebelum menulis')
+    parser.add_argument('--rows-per-shard', type=int, metavar='N',
+                        help='Tulis juga shard Rows_1-N, Rows_N+1-2N, ... per class')
+    parser.add_argument('--pattern', type=str, default=DEFAULT_MASTER_GLOB,
+                        help=f'Glob file chunk jika master adalah folder (default: {DEFAULT_MASTER_GLOB})')
+
+    args = parser.parse_args()
+
+    master_path = Path(args.master)
+    if not master_path.exists():
+        print(f"[FAILED] Error: Path not found: {master_path}")
+        sys.exit(1)
+
+    if args.per_class <= 0 or (args.rows_per_shard is not None and args.rows_per_shard <= 0):
+        print(f"[FAILED] Error: --per-class dan --rows-per-shard harus > 0")
+        sys.exit(1)
+
+    output_dir = Path(args.output)
+
+    try:
+        # Tanpa --overwrite: gagal cepat sebelum membaca master
+        if not args.overwrite:
+            prepare_output_dir(output_dir, overwrite=False)
+        df = load_master(master_path, args.pattern)
+        class_index, dropped = group_classes(df)
+        prepare_output_dir(output_dir, args.overwrite)
+    except (FileNotFoundError, FileExistsError, KeyError) as e:
+        print(f"[FAILED] Error: {e}")
+        sys.exit(1)
+
+    print(f"Total rows: {len(df)}, classes: {len(class_index)}")
+
+    sampled = stratified_sample(class_index, args.per_class, args.seed)
+    results = write_classes(df, sampled, output_dir, args.rows_per_shard)
+
+    print_summary(class_index, results, args.per_class, dropped, output_dir)
+
+
+if __name__ == '__main__':
+    main()
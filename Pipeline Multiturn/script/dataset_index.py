@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Dataset Byte-Offset Index
+
+Sidecar index untuk dataset multi-turn JSONL yang ditulis oleh validator
+selama scan. Setiap conversation disimpan sebagai satu record fixed-size
+(file id, line, byte offset, length, area, level, turn count, valid flag)
+sehingga query bisa langsung seek ke record tanpa membaca ulang seluruh
+directory.
+
+Layout index directory:
+    records.bin   - array record fixed-size (memory-mapped saat dibaca)
+    meta.json     - tabel file & area, format record, waktu pembuatan
+    errors.jsonl  - error log (1 baris per error, schema: error_entry); bisa
+                    diarahkan ke file lain, path-nya dicatat di meta.json
+"""
+
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+
+INDEX_VERSION = 1
+
+RECORDS_FILE = "records.bin"
+META_FILE = "meta.json"
+ERRORS_FILE = "errors.jsonl"
+
+# file_id, line, offset, length, area_id, level, valid, turn_count
+RECORD_STRUCT = struct.Struct("<IIQIHBBH")
+
+UNKNOWN_AREA = 0xFFFF
+UNKNOWN_LEVEL = 0
+
+
+def error_entry(record: Optional[int], filepath: Path, line_num: int,
+                category: Optional[str], error: Optional[str]) -> Dict:
+    """Schema tunggal error log (dipakai index writer & streaming validator).
+
+    record bernilai None jika tidak ada index, atau untuk error level file (line 0).
+    """
+    return {
+        'record': record,
+        'file': Path(filepath).name,
+        'filepath': str(filepath),
+        'line': line_num,
+        'category': category,
+        'error': error,
+    }
+
+
+class DatasetIndexWriter:
+    """Writer incremental untuk sidecar index, dipanggil per conversation."""
+
+    def __init__(self, index_dir: Path, errors_path: Optional[Path] = None):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.errors_path = Path(errors_path) if errors_path else self.index_dir / ERRORS_FILE
+
+        self.files: List[str] = []
+        self.areas: List[str] = []
+        self._file_ids: Dict[str, int] = {}
+        self._area_ids: Dict[str, int] = {}
+        self.record_count = 0
+        self.error_count = 0
+
+        self._records = open(self.index_dir / RECORDS_FILE, 'wb')
+        self._errors = open(self.errors_path, 'w', encoding='utf-8')
+
+    def _file_id(self, filepath: Path) -> int:
+        # Path disimpan relatif terhadap index directory agar index tetap
+        # valid selama dataset & index dipindah bersama
+        key = os.path.relpath(Path(filepath).resolve(), self.index_dir.resolve())
+        if key not in self._file_ids:
+            self._file_ids[key] = len(self.files)
+            self.files.append(key)
+        return self._file_ids[key]
+
+    def _area_id(self, area: Optional[str]) -> int:
+        if not area:
+            return UNKNOWN_AREA
+        if area not in self._area_ids:
+            self._area_ids[area] = len(self.areas)
+            self.areas.append(area)
+        return self._area_ids[area]
+
+    @property
+    def next_record(self) -> int:
+        """Nomor record yang akan diberikan oleh add() berikutnya."""
+        return self.record_count
+
+    def write_error(self, entry: Dict):
+        """Tulis satu entry (lihat error_entry) ke error log."""
+        self._errors.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def add(self, filepath: Path, line_num: int, offset: int, length: int,
+            area: Optional[str], level: Optional[int], turn_count: int,
+            is_valid: bool, error: Optional[str] = None, category: Optional[str] = None,
+            log_error: bool = True):
+        """Tambahkan satu record conversation ke index.
+
+        log_error=False jika entry error record ini sudah ditulis oleh pemanggil
+        lewat write_error (mis. validator yang juga melakukan sampling).
+        """
+        file_id = self._file_id(filepath)
+        level_val = level if level is not None and 0 < level < 256 else UNKNOWN_LEVEL
+
+        self._records.write(RECORD_STRUCT.pack(
+            file_id,
+            line_num,
+            offset,
+            length,
+            self._area_id(area),
+            level_val,
+            1 if is_valid else 0,
+            min(turn_count, 0xFFFF),
+        ))
+
+        if not is_valid:
+            if log_error:
+                self.write_error(error_entry(self.record_count, filepath, line_num, category, error))
+            self.error_count += 1
+
+        self.record_count += 1
+
+    def close(self):
+        """Flush records dan tulis meta.json."""
+        self._records.close()
+        self._errors.close()
+
+        meta = {
+            'version': INDEX_VERSION,
+            'created': datetime.now().isoformat(),
+            'record_format': RECORD_STRUCT.format,
+            'record_size': RECORD_STRUCT.size,
+            'record_count': self.record_count,
+            'error_count': self.error_count,
+            'errors_file': os.path.relpath(self.errors_path.resolve(), self.index_dir.resolve()),
+            'files': self.files,
+            'areas': self.areas,
+        }
+        with open(self.index_dir / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class DatasetIndex:
+    """Reader read-only untuk sidecar index (records di-memory-map)."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+
+        with open(self.index_dir / META_FILE, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        if self.meta.get('version') != INDEX_VERSION or self.meta.get('record_format') != RECORD_STRUCT.format:
+            raise ValueError(f"Index format tidak dikenali di {self.index_dir} (rebuild dengan validate_dataset.py --index)")
+
+        self.files: List[str] = self.meta['files']
+        self.areas: List[str] = self.meta['areas']
+
+        self._fh = open(self.index_dir / RECORDS_FILE, 'rb')
+        size = os.fstat(self._fh.fileno()).st_size
+        # mmap tidak bisa memetakan file kosong
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __len__(self) -> int:
+        return self.meta['record_count']
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _to_dict(self, record_id: int, fields: tuple) -> Dict:
+        file_id, line_num, offset, length, area_id, level, valid, turn_count = fields
+        return {
+            'record': record_id,
+            'file': self.files[file_id],
+            'line': line_num,
+            'offset': offset,
+            'length': length,
+            'area_fungsi': self.areas[area_id] if area_id != UNKNOWN_AREA else None,
+            'level': level if level != UNKNOWN_LEVEL else None,
+            'turn_count': turn_count,
+            'valid': bool(valid),
+        }
+
+    def record(self, record_id: int) -> Dict:
+        """Ambil satu record berdasarkan nomor record."""
+        if not 0 <= record_id < len(self):
+            raise IndexError(f"Record {record_id} di luar range (0-{len(self) - 1})")
+        fields = RECORD_STRUCT.unpack_from(self._mm, record_id * RECORD_STRUCT.size)
+        return self._to_dict(record_id, fields)
+
+    def records(self) -> Iterator[Dict]:
+        """Iterasi semua record secara berurutan."""
+        if self._mm is None:
+            return
+        for record_id, fields in enumerate(RECORD_STRUCT.iter_unpack(self._mm)):
+            yield self._to_dict(record_id, fields)
+
+    def find(self, area_ids: Optional[Set[int]] = None, level: Optional[int] = None,
+             valid: Optional[bool] = None, min_turns: Optional[int] = None,
+             max_turns: Optional[int] = None, file_ids: Optional[Set[int]] = None,
+             line: Optional[int] = None, record_ids: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+        """Iterasi record yang cocok dengan filter.
+
+        Filter dibandingkan langsung pada field hasil unpack (integer id), dict
+        hanya dibangun untuk record yang cocok. Jika record_ids diberikan,
+        hanya record tersebut yang dibaca (tanpa scan records.bin).
+        """
+        if self._mm is None:
+            return
+
+        if record_ids is not None:
+            candidates = ((rid, RECORD_STRUCT.unpack_from(self._mm, rid * RECORD_STRUCT.size))
+                          for rid in record_ids if 0 <= rid < len(self))
+        else:
+            candidates = enumerate(RECORD_STRUCT.iter_unpack(self._mm))
+
+        valid_flag = None if valid is None else (1 if valid else 0)
+
+        for record_id, fields in candidates:
+            file_id, line_num, _, _, area_id, level_val, is_valid, turn_count = fields
+            if area_ids is not None and area_id not in area_ids:
+                continue
+            if level is not None and level_val != level:
+                continue
+            if valid_flag is not None and is_valid != valid_flag:
+                continue
+            if min_turns is not None and turn_count < min_turns:
+                continue
+            if max_turns is not None and turn_count > max_turns:
+                continue
+            if file_ids is not None and file_id not in file_ids:
+                continue
+            if line is not None and line_num != line:
+                continue
+            yield self._to_dict(record_id, fields)
+
+    def errors(self) -> Iterator[Dict]:
+        """Iterasi error log (hanya record yang invalid)."""
+        errors_path = self.index_dir / self.meta.get('errors_file', ERRORS_FILE)
+        if not errors_path.exists():
+            return
+        with open(errors_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def resolve_path(self, rel_file: str) -> Path:
+        """Path absolut dari file dataset untuk sebuah record."""
+        return (self.index_dir / rel_file).resolve()
+
+    def read_raw(self, rec: Dict) -> bytes:
+        """Seek langsung ke conversation dan kembalikan baris JSONL mentah."""
+        with open(self.resolve_path(rec['file']), 'rb') as f:
+            f.seek(rec['offset'])
+            return f.read(rec['length'])
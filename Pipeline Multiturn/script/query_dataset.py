@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Dataset Query Tool (Random Access)
+
+Query dataset multi-turn lewat sidecar index yang dibuat oleh
+`validate_dataset.py --index DIR`. Filter, sampling, dan lookup error
+dilakukan di atas index (memory-mapped), lalu conversation yang cocok
+dibaca langsung dengan seek ke byte offset-nya - tanpa full scan.
+
+Usage:
+    python query_dataset.py ../DatasetIndex --stats
+    python query_dataset.py ../DatasetIndex --area "Keamanan Informasi Dan Siber" --level 7 --sample 50
+    python query_dataset.py ../DatasetIndex --invalid --sample 5 --per-class --show
+    python query_dataset.py ../DatasetIndex --errors --file batch_003.jsonl
+    python query_dataset.py ../DatasetIndex --file batch_003.jsonl --line 12 --show
+"""
+
+import argparse
+import json
+import random
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from dataset_index import DatasetIndex
+
+
+def _normalize_area(area: Optional[str]) -> str:
+    """Normalisasi area fungsi (sama dengan DatasetValidator._normalize_area_fungsi)."""
+    if not area:
+        return ""
+    return ' '.join(area.replace('-', ' ').split()).lower()
+
+
+def resolve_area_ids(index: DatasetIndex, area: str) -> Set[int]:
+    """Id area di index yang cocok dengan nama area (case/hyphen-insensitive)."""
+    area_norm = _normalize_area(area)
+    return {i for i, name in enumerate(index.areas) if _normalize_area(name) == area_norm}
+
+
+def resolve_file_ids(index: DatasetIndex, file: str) -> Set[int]:
+    """Id file di index yang cocok dengan basename atau path yang tersimpan di index."""
+    return {i for i, name in enumerate(index.files) if name == file or Path(name).name == file}
+
+
+def sample_records(records: List[Dict], n: int, per_class: bool = False, seed: Optional[int] = None) -> List[Dict]:
+    """Random sample n record; jika per_class, n record per (area, level)."""
+    rng = random.Random(seed)
+
+    if not per_class:
+        if len(records) <= n:
+            return list(records)
+        return sorted(rng.sample(records, n), key=lambda r: r['record'])
+
+    strata = defaultdict(list)
+    for rec in records:
+        strata[(rec['area_fungsi'] or '', rec['level'] or 0)].append(rec)
+
+    sampled = []
+    for key in sorted(strata):
+        group = strata[key]
+        sampled.extend(group if len(group) <= n else rng.sample(group, n))
+    return sorted(sampled, key=lambda r: r['record'])
+
+
+def print_stats(records: List[Dict]):
+    """Print ringkasan distribusi record hasil filter."""
+    total = len(records)
+    valid = sum(1 for r in records if r['valid'])
+
+    print(f"\n{'='*70}")
+    print(f"[INFO] INDEX QUERY STATS")
+    print(f"{'='*70}")
+    print(f"   Total: {total}")
+    print(f"   Valid: {valid} ({valid/max(total,1)*100:.1f}%)")
+    print(f"   Invalid: {total - valid} ({(total - valid)/max(total,1)*100:.1f}%)")
+
+    classes = Counter((r['area_fungsi'] or 'unknown', r['level']) for r in records)
+    if classes:
+        print(f"\nPer Class (Area Fungsi, Level):")
+        for (area, level), count in sorted(classes.items(), key=lambda kv: (kv[0][0], kv[0][1] or 0)):
+            print(f"   {area} - Level {level if level is not None else '?'}: {count}")
+    print(f"{'='*70}\n")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description='Random-access query over multi-turn dataset via sidecar index',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python query_dataset.py ../DatasetIndex --stats
+  python query_dataset.py ../DatasetIndex --area "Keamanan Informasi Dan Siber" --level 7 --sample 50
+  python query_dataset.py ../DatasetIndex --invalid --sample 5 --per-class --show
+  python query_dataset.py ../DatasetIndex --errors --file batch_003.jsonl
+  python query_dataset.py ../DatasetIndex --file batch_003.jsonl --line 12 --show
+        """
+    )
+
+    parser.add_argument('index', help='Index directory (dibuat oleh validate_dataset.py --index)')
+    parser.add_argument('--area', type=str, help='Filter Area Fungsi (case/hyphen-insensitive)')
+    parser.add_argument('--level', type=int, help='Filter Level Okupasi')
+    status = parser.add_mutually_exclusive_group()
+    status.add_argument('--valid', action='store_true', help='Hanya conversation valid')
+    status.add_argument('--invalid', action='store_true', help='Hanya conversation invalid')
+    status.add_argument('--errors', action='store_true', help='Hanya conversation invalid, dengan pesan error dari error log index')
+    parser.add_argument('--min-turns', type=int, help='Minimum jumlah message')
+    parser.add_argument('--max-turns', type=int, help='Maximum jumlah message')
+    parser.add_argument('--file', type=str, help='Filter nama file JSONL (basename atau path di index)')
+    parser.add_argument('--line', type=int, help='Filter nomor baris dalam file')
+    parser.add_argument('--sample', type=int, metavar='N', help='Random sample N record')
+    parser.add_argument('--per-class', action='store_true', help='Dengan --sample: N record per (area, level)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed untuk sampling (reproducible)')
+    parser.add_argument('--show', action='store_true', help='Print isi conversation (seek langsung ke offset)')
+    parser.add_argument('--output', type=str, metavar='FILE', help='Tulis conversation hasil query ke JSONL')
+    parser.add_argument('--stats', action='store_true', help='Print ringkasan distribusi hasil query')
+
+    args = parser.parse_args()
+
+    index_dir = Path(args.index)
+    if not index_dir.exists():
+        print(f"[FAILED] Error: Index not found: {index_dir}")
+        sys.exit(1)
+
+    try:
+        index = DatasetIndex(index_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[FAILED] Error: Cannot open index: {e}")
+        sys.exit(1)
+
+    with index:
+        valid = True if args.valid else (False if (args.invalid or args.errors) else None)
+
+        if args.errors:
+            # Error log hanya berisi record invalid -> hanya record tersebut yang dibaca
+            # Error level file (record None) tidak punya record di index
+            error_msgs = {err['record']: err['error'] for err in index.errors() if err['record'] is not None}
+            record_ids = list(error_msgs)
+        else:
+            error_msgs = None
+            record_ids = None
+
+        matches = list(index.find(
+            area_ids=resolve_area_ids(index, args.area) if args.area else None,
+            level=args.level,
+            valid=valid,
+            min_turns=args.min_turns,
+            max_turns=args.max_turns,
+            file_ids=resolve_file_ids(index, args.file) if args.file else None,
+            line=args.line,
+            record_ids=record_ids,
+        ))
+
+        if args.sample is not None:
+            matches = sample_records(matches, args.sample, per_class=args.per_class, seed=args.seed)
+
+        if args.stats:
+            print_stats(matches)
+            return
+
+        if error_msgs is None and any(not r['valid'] for r in matches):
+            # Lookup pesan error untuk record invalid yang ditampilkan
+            wanted = {r['record'] for r in matches if not r['valid']}
+            error_msgs = {e['record']: e['error'] for e in index.errors() if e['record'] in wanted}
+
+        writer = open(args.output, 'w', encoding='utf-8') if args.output else None
+        try:
+            for rec in matches:
+                status_tag = 'VALID' if rec['valid'] else 'INVALID'
+                print(f"#{rec['record']} {rec['file']}:{rec['line']} "
+                      f"[{status_tag}] {rec['area_fungsi'] or 'unknown'} - Level {rec['level'] if rec['level'] is not None else '?'} "
+                      f"({rec['turn_count']} messages)")
+
+                if not rec['valid'] and error_msgs:
+                    print(f"   Error: {error_msgs.get(rec['record'])}")
+
+                if args.show or writer:
+                    raw = index.read_raw(rec).decode('utf-8')
+                    if args.show:
+                        try:
+                            print(json.dumps(json.loads(raw), indent=2, ensure_ascii=False))
+                        except json.JSONDecodeError:
+                            print(raw)
+                    if writer:
+                        writer.write(raw.strip() + "\n")
+        finally:
+            if writer:
+                writer.close()
+
+        print(f"\n[INFO] {len(matches)} record(s) matched")
+        if args.output:
+            print(f"[INFO] Conversations written to: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,16 +13,21 @@ Usage:
     python validate_dataset.py /path/to/dataset/directory
     python validate_dataset.py /path/to/single/file.jsonl
     python validate_dataset.py --all  # validate semua output
+    python validate_dataset.py --all --index ../DatasetIndex  # + sidecar index untuk query_dataset.py
+    python validate_dataset.py --all --error-log errors.jsonl  # streaming error report (memory-bounded)
 """
 
 import json
 import argparse
+import random
 from pathlib import Path
 from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Optional
 import sys
 from datetime import datetime
 
+from dataset_index import DatasetIndexWriter, error_entry
+
 
 class DatasetValidator:
     """Validator untuk dataset multi-turn conversation."""
@@ -37,7 +42,26 @@ class DatasetValidator:
         "Layanan Teknologi Informasi": (1, 8)
     }
     
-    def __init__(self):
+    # Jumlah error per file yang disimpan/ditampilkan pada streaming mode
+    FILE_ERROR_PREVIEW = 5
+    
+    def __init__(self, index_writer: Optional[DatasetIndexWriter] = None,
+                 error_log: Optional[Path] = None, error_sample_size: int = 20):
+        self.index_writer = index_writer
+        
+        # Streaming mode: error ditulis ke JSONL saat terjadi, di memory hanya
+        # counter + reservoir sample per kategori. Jika index aktif, error log
+        # dipegang index writer (satu stream, satu schema) - buat writer dengan
+        # errors_path=error_log agar keduanya menunjuk file yang sama.
+        self.error_log_path = Path(error_log) if error_log else None
+        self._error_log = None
+        if error_log and index_writer is None:
+            self._error_log = open(self.error_log_path, 'w', encoding='utf-8')
+        self.error_sample_size = error_sample_size
+        self.error_samples = defaultdict(list)
+        self._errors_seen = Counter()
+        self._rng = random.Random(0)
+        
         self.stats = {
             'total_files': 0,
             'total_conversations': 0,
@@ -392,6 +416,78 @@ class DatasetValidator:
         
         return metadata
     
+    @property
+    def streaming(self) -> bool:
+        return self.error_log_path is not None
+    
+    def close(self):
+        """Tutup error log (streaming mode)."""
+        if self._error_log is not None:
+            self._error_log.close()
+            self._error_log = None
+    
+    def _sample_error(self, category: str, entry: Dict):
+        """Reservoir sampling (Algorithm R) per kategori error."""
+        self._errors_seen[category] += 1
+        samples = self.error_samples[category]
+        if len(samples) < self.error_sample_size:
+            samples.append(entry)
+        else:
+            j = self._rng.randrange(self._errors_seen[category])
+            if j < self.error_sample_size:
+                samples[j] = entry
+    
+    def _record_error(self, file_stats: Dict, filepath: Path, line_num: int, error_msg: str, category: str):
+        """Catat satu error: in-memory (default) atau streaming ke error log."""
+        error = {
+            'line': line_num,
+            'error': error_msg,
+            'severity': 'critical'
+        }
+        
+        if self.index_writer is not None:
+            # Error per conversation: record id = record yang ditulis _index_record setelah ini
+            record = self.index_writer.next_record if line_num > 0 else None
+            entry = error_entry(record, filepath, line_num, category, error_msg)
+            self.index_writer.write_error(entry)
+        else:
+            entry = error_entry(None, filepath, line_num, category, error_msg)
+        
+        if not self.streaming:
+            file_stats['errors'].append(error)
+            return
+        
+        if self._error_log is not None:
+            self._error_log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._sample_error(category, entry)
+        
+        # Hanya preview beberapa error pertama per file yang disimpan
+        file_stats['error_count'] = file_stats.get('error_count', 0) + 1
+        if len(file_stats['errors']) < self.FILE_ERROR_PREVIEW:
+            file_stats['errors'].append(error)
+    
+    def _index_record(self, filepath: Path, line_num: int, offset: int, length: int,
+                      messages: Optional[List[Dict]], error_msg: Optional[str]):
+        """Tulis satu record ke sidecar index (jika index writer aktif)."""
+        # Area & level diambil dari folder (target class), fallback ke <RESULT>
+        area_fungsi, level = self._parse_folder_name(filepath)
+        turn_count = len(messages) if isinstance(messages, list) else 0
+        
+        if not area_fungsi and isinstance(messages, list):
+            try:
+                metadata = self.extract_metadata(messages)
+                area_fungsi = metadata['area_fungsi']
+                level = int(metadata['level']) if metadata['level'] else None
+            except Exception:
+                pass
+        
+        # Entry error sudah ditulis oleh _record_error
+        self.index_writer.add(
+            filepath, line_num, offset, length,
+            area_fungsi, level, turn_count,
+            is_valid=error_msg is None, error=error_msg, log_error=False
+        )
+    
     def validate_file(self, filepath: Path) -> Dict:
         """Validasi single JSONL file."""
         file_stats = {
@@ -404,15 +500,23 @@ class DatasetValidator:
         }
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
+            # Binary mode agar byte offset tiap baris bisa dicatat untuk index
+            with open(filepath, 'rb') as f:
+                offset = 0
+                for line_num, raw_line in enumerate(f, 1):
+                    line_offset = offset
+                    offset += len(raw_line)
+                    
+                    line = raw_line.decode('utf-8').strip()
                     if not line:
                         continue
                     
                     file_stats['total_lines'] += 1
                     self.stats['total_conversations'] += 1
                     
+                    messages = None
+                    error_msg = None
+                    
                     try:
                         # Parse JSON
                         data = json.loads(line)
@@ -420,11 +524,7 @@ class DatasetValidator:
                         # Validate structure
                         if 'messages' not in data:
                             error_msg = "Missing 'messages' field"
-                            file_stats['errors'].append({
-                                'line': line_num,
-                                'error': error_msg,
-                                'severity': 'critical'
-                            })
+                            self._record_error(file_stats, filepath, line_num, error_msg, 'missing_messages_field')
                             file_stats['invalid_count'] += 1
                             self.stats['invalid_conversations'] += 1
                             self.stats['errors_by_type']['missing_messages_field'] += 1
@@ -438,30 +538,28 @@ class DatasetValidator:
                         )
                         
                         if not is_valid:
-                            file_stats['errors'].append({
-                                'line': line_num,
-                                'error': error_msg,
-                                'severity': 'critical'
-                            })
-                            file_stats['invalid_count'] += 1
-                            self.stats['invalid_conversations'] += 1
-                            
                             # Categorize error
                             if 'corruption' in error_msg.lower() or 'json' in error_msg.lower():
-                                self.stats['errors_by_type']['json_corruption'] += 1
+                                category = 'json_corruption'
                             elif 'sequence' in error_msg.lower():
-                                self.stats['errors_by_type']['role_sequence'] += 1
+                                category = 'role_sequence'
                             elif 'system' in error_msg.lower():
-                                self.stats['errors_by_type']['system_prompt'] += 1
+                                category = 'system_prompt'
                             else:
-                                self.stats['errors_by_type']['other'] += 1
+                                category = 'other'
                             
-                            # Store detailed error
-                            self.stats['validation_errors'].append({
-                                'file': filepath.name,
-                                'line': line_num,
-                                'error': error_msg
-                            })
+                            self._record_error(file_stats, filepath, line_num, error_msg, category)
+                            file_stats['invalid_count'] += 1
+                            self.stats['invalid_conversations'] += 1
+                            self.stats['errors_by_type'][category] += 1
+                            
+                            # Store detailed error (streaming mode: sudah ada di error log)
+                            if not self.streaming:
+                                self.stats['validation_errors'].append({
+                                    'file': filepath.name,
+                                    'line': line_num,
+                                    'error': error_msg
+                                })
                             
                             continue
                         
@@ -480,38 +578,29 @@ class DatasetValidator:
                         
                     except json.JSONDecodeError as e:
                         error_msg = f"JSON decode error: {str(e)}"
-                        file_stats['errors'].append({
-                            'line': line_num,
-                            'error': error_msg,
-                            'severity': 'critical'
-                        })
+                        self._record_error(file_stats, filepath, line_num, error_msg, 'json_decode')
                         file_stats['invalid_count'] += 1
                         self.stats['invalid_conversations'] += 1
                         self.stats['errors_by_type']['json_decode'] += 1
                     
                     except Exception as e:
                         error_msg = f"Unexpected error: {str(e)}"
-                        file_stats['errors'].append({
-                            'line': line_num,
-                            'error': error_msg,
-                            'severity': 'critical'
-                        })
+                        self._record_error(file_stats, filepath, line_num, error_msg, 'unexpected')
                         file_stats['invalid_count'] += 1
                         self.stats['invalid_conversations'] += 1
                         self.stats['errors_by_type']['unexpected'] += 1
+                    
+                    finally:
+                        if self.index_writer is not None:
+                            self._index_record(
+                                filepath, line_num, line_offset,
+                                len(raw_line.rstrip(b'\r\n')), messages, error_msg
+                            )
         
         except FileNotFoundError:
-            file_stats['errors'].append({
-                'line': 0,
-                'error': 'File not found',
-                'severity': 'critical'
-            })
+            self._record_error(file_stats, filepath, 0, 'File not found', 'file_not_found')
         except Exception as e:
-            file_stats['errors'].append({
-                'line': 0,
-                'error': f'File read error: {str(e)}',
-                'severity': 'critical'
-            })
+            self._record_error(file_stats, filepath, 0, f'File read error: {str(e)}', 'file_read')
         
         return file_stats
     
@@ -608,11 +697,15 @@ class DatasetValidator:
                     print(f"Valid: {file_stat['valid_count']}, Invalid: {file_stat['invalid_count']}")
                     
                     # Show first 5 errors
-                    for error in file_stat['errors'][:5]:
+                    for error in file_stat['errors'][:self.FILE_ERROR_PREVIEW]:
                         print(f"Line {error['line']}: {error['error']}")
                     
-                    if len(file_stat['errors']) > 5:
-                        print(f"... and {len(file_stat['errors']) - 5} more errors")
+                    error_count = file_stat.get('error_count', len(file_stat['errors']))
+                    if error_count > self.FILE_ERROR_PREVIEW:
+                        print(f"... and {error_count - self.FILE_ERROR_PREVIEW} more errors")
+            
+            if self.streaming:
+                print(f"\n[INFO] Full error log: {self.error_log_path}")
         
         # Quality score
         print(f"\n{'='*70}")
@@ -634,9 +727,19 @@ class DatasetValidator:
         
         print(f"{'='*70}\n")
     
+    @staticmethod
+    def _dump_nested(obj, level: int) -> str:
+        """json.dumps dengan indent=2 yang digeser sesuai kedalaman di report."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).replace('\n', '\n' + '  ' * level)
+    
     def export_report(self, output_path: Path, file_results: List[Dict]):
-        """Export detailed validation report to JSON."""
-        report = {
+        """Export detailed validation report to JSON.
+        
+        Report ditulis incremental per section (file_details per entry) sehingga
+        tidak perlu membangun satu dict besar di memory. Pada streaming mode,
+        'validation_errors' diganti dengan path error log + reservoir sample per kategori.
+        """
+        sections = {
             'timestamp': datetime.now().isoformat(),
             'summary': {
                 'total_files': self.stats['total_files'],
@@ -659,12 +762,32 @@ class DatasetValidator:
                 'levels': dict(self.stats['level_distribution']),
                 'areas': dict(self.stats['area_distribution']),
             },
-            'file_details': file_results,
-            'validation_errors': self.stats['validation_errors'][:100],  # Limit to 100
         }
         
+        if self.streaming:
+            tail_sections = {
+                'error_log': str(self.error_log_path),
+                'error_samples': dict(self.error_samples),
+            }
+        else:
+            tail_sections = {
+                'validation_errors': self.stats['validation_errors'][:100],  # Limit to 100
+            }
+        
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('{')
+            for key, value in sections.items():
+                f.write(f'\n  {json.dumps(key)}: {self._dump_nested(value, 1)},')
+            
+            f.write('\n  "file_details": [')
+            for i, file_stat in enumerate(file_results):
+                f.write(',' if i else '')
+                f.write(f'\n    {self._dump_nested(file_stat, 2)}')
+            f.write('\n  ]' if file_results else ']')
+            
+            for key, value in tail_sections.items():
+                f.write(f',\n  {json.dumps(key)}: {self._dump_nested(value, 1)}')
+            f.write('\n}')
         
         print(f"[INFO] Detailed report exported to: {output_path}")
 
@@ -680,6 +803,8 @@ Examples:
   python validate_dataset.py /path/to/file.jsonl
   python validate_dataset.py --all
   python validate_dataset.py /path/to/dataset --export report.json
+  python validate_dataset.py --all --index ../DatasetIndex
+  python validate_dataset.py --all --error-log errors.jsonl --export report.json
         """
     )
     
@@ -699,6 +824,25 @@ Examples:
         metavar='FILE',
         help='Export detailed report to JSON file'
     )
+    parser.add_argument(
+        '--index',
+        type=str,
+        metavar='DIR',
+        help='Write byte-offset sidecar index to DIR (query with query_dataset.py)'
+    )
+    parser.add_argument(
+        '--error-log',
+        type=str,
+        metavar='FILE',
+        help='Streaming mode: write errors to JSONL as they occur, keep only counters + samples in memory'
+    )
+    parser.add_argument(
+        '--error-samples',
+        type=int,
+        default=20,
+        metavar='N',
+        help='Streaming mode: reservoir sample size per error category (default: 20)'
+    )
     
     args = parser.parse_args()
     
@@ -718,14 +862,28 @@ Examples:
         sys.exit(1)
     
     # Create validator
-    validator = DatasetValidator()
+    error_log = Path(args.error_log) if args.error_log else None
+    index_writer = DatasetIndexWriter(Path(args.index), errors_path=error_log) if args.index else None
+    validator = DatasetValidator(
+        index_writer=index_writer,
+        error_log=error_log,
+        error_sample_size=args.error_samples,
+    )
     
     # Validate
-    if target_path.is_file():
-        print(f"Validating single file: {target_path}")
-        file_results = [validator.validate_file(target_path)]
-    else:
-        file_results = validator.validate_directory(target_path)
+    try:
+        if target_path.is_file():
+            print(f"Validating single file: {target_path}")
+            file_results = [validator.validate_file(target_path)]
+        else:
+            file_results = validator.validate_directory(target_path)
+    finally:
+        validator.close()
+        if index_writer is not None:
+            index_writer.close()
+    
+    if index_writer is not None:
+        print(f"[INFO] Index written to: {args.index} ({index_writer.record_count} records, {index_writer.error_count} errors)")
     
     # Print summary
     validator.print_summary(file_results)